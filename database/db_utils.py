@@ -1,4 +1,7 @@
-import pandas_gbq
+import io
+import pyarrow as pa
+import pyarrow.parquet as pq
+from google.cloud import bigquery
 
 game_table_schema = [
     {'name': 'game_id', 'type': 'INTEGER'},
@@ -24,10 +27,27 @@ game_table_schema = [
     {'name': 'game_notes', 'type': 'STRING'}
 ]
 
+# Maps the pandas-style if_exists options to BigQuery load job dispositions
+write_dispositions = {
+    'fail': 'WRITE_EMPTY',
+    'replace': 'WRITE_TRUNCATE',
+    'append': 'WRITE_APPEND'
+}
+
+# Arrow types for the BigQuery column types used in the table schemas
+arrow_types = {
+    'INTEGER': pa.int64(),
+    'STRING': pa.string(),
+    'DATE': pa.date32(),
+    'BOOLEAN': pa.bool_()
+}
+
 def df_to_db(df, project_id, dataset, table_name, table_schema, if_exists):
     """
-    Pushes a DataFrame to a database. By default uses BigQuery, but modifyable
-    to fit database of choice.
+    Pushes a DataFrame to a database. By default uses a single BigQuery load
+    job, but modifyable to fit database of choice. The DataFrame is converted
+    to Parquet with the Arrow schema given by table_schema, so no column types
+    are inferred on the way.
 
     Args:
         df (pd.DataFrame): the DataFrame that will be pushed to the DB
@@ -40,11 +60,22 @@ def df_to_db(df, project_id, dataset, table_name, table_schema, if_exists):
     Returns:
         None
     """
-    pandas_gbq.to_gbq(dataframe=df, 
-                      destination_table=dataset + '.' + table_name, 
-                      project_id=project_id, 
-                      if_exists=if_exists, 
-                      table_schema=table_schema,
-                      progress_bar=False)
+    arrow_schema = pa.schema([pa.field(col['name'], arrow_types[col['type']])
+                              for col in table_schema])
+    arrow_table = pa.Table.from_pandas(df, schema=arrow_schema, preserve_index=False)
+    parquet_buffer = io.BytesIO()
+    pq.write_table(arrow_table, parquet_buffer)
+    parquet_buffer.seek(0)
+
+    client = bigquery.Client(project=project_id)
+    job_config = bigquery.LoadJobConfig(
+        schema=[bigquery.SchemaField(col['name'], col['type']) for col in table_schema],
+        source_format=bigquery.SourceFormat.PARQUET,
+        write_disposition=write_dispositions[if_exists]
+    )
+    load_job = client.load_table_from_file(parquet_buffer, 
+                                           dataset + '.' + table_name, 
+                                           job_config=job_config)
+    load_job.result()
 
     return None
\ No newline at end of file
@@ -1,36 +1,199 @@
 if __name__ == '__main__':
     import sys
-    from os import path
+    import multiprocessing
+    from os import path, makedirs, cpu_count
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+    import pandas as pd
     from scraper.utils.scraper import Scraper
-    from scraper.episode_scraper import scrape_episode
+    from scraper.episode_scraper import get_episode_html, parse_episode
+    from scraper.utils.parsers import col_order_and_dtypes
     from database.db_utils import df_to_db, game_table_schema
     from database.db_conf import db_conf
 
-    HTML_PARSER = 'html.parser'
+    HTML_PARSER = 'lxml'
     ROBOTS_TXT_URL = 'http://www.j-archive.com/robots.txt'
     EPISODE_BASE_URL = 'http://www.j-archive.com/showgame.php?game_id='
+    HTML_DIR = path.join('data', 'html')
+    DONE_LOG = path.join('log', 'scraper_done_game_id_log.txt')
+    ROBOTS_CACHE = path.join('log', 'robots.json')
+    MAX_WORKERS = 8  # fetching threads
+    MAX_PENDING_FETCHES = 2 * MAX_WORKERS  # pages fetched ahead of the parsing
+    PARSE_WORKERS = cpu_count() or 1
+    MAX_PENDING_PARSES = 2 * PARSE_WORKERS  # parses in flight before waiting on the oldest
+    BATCH_SIZE = 200  # episodes per upload, roughly 12k rows
+    UPLOAD_TRIES = 3
 
     start_ep_num = int(sys.argv[1])
     end_ep_num = int(sys.argv[2])
     if_exists = sys.argv[3]
+    html_parser = sys.argv[4] if len(sys.argv) > 4 else HTML_PARSER
 
     project_id = db_conf['project-id']
 
-    j_scraper = Scraper(robots_txt_url=ROBOTS_TXT_URL)
-    for episode_num in range(start_ep_num, end_ep_num+1):
-        print(f'Scraping/parsing episode #{episode_num}')
+    makedirs('log', exist_ok=True)
+    makedirs(HTML_DIR, exist_ok=True)
+
+    # Games already uploaded by an earlier, interrupted run are skipped. A
+    # replace run rewrites the whole table, so it starts a fresh checkpoint.
+    done = set()
+    if if_exists == 'replace':
+        open(DONE_LOG, 'w').close()
+    elif path.exists(DONE_LOG):
+        with open(DONE_LOG) as done_log:
+            done = set(int(line) for line in done_log if line.strip())
+    episode_nums = [n for n in range(start_ep_num, end_ep_num+1) if n not in done]
+    n_skipped = end_ep_num - start_ep_num + 1 - len(episode_nums)
+    print(f'Skipping {n_skipped} already uploaded episodes')
+
+    # A fail run that is being resumed has already filled the table with its
+    # first batches, so the rest are appended instead of failing on it
+    if if_exists == 'fail' and n_skipped:
+        if_exists = 'append'
+
+    j_scraper = Scraper(robots_txt_url=ROBOTS_TXT_URL, robots_cache_path=ROBOTS_CACHE)
+
+    def fetch(episode_num):
+        # The Scraper rate limits the fetches; errors are reported back to the
+        # main thread so the log is only written from one place
+        print(f'Scraping episode #{episode_num}')
         try:
-            episode_df = scrape_episode(j_scraper, episode_num, HTML_PARSER, EPISODE_BASE_URL)
-            df_to_db(df=episode_df, 
-                    project_id=project_id, 
-                    dataset='dev_question_data', 
-                    table_name='question_data', 
-                    table_schema=game_table_schema, 
-                    if_exists=if_exists
-                    )
+            page_html = get_episode_html(j_scraper, episode_num, EPISODE_BASE_URL, HTML_DIR)
+            if page_html is None:
+                # The Scraper gave up or robots.txt disallows the page
+                raise RuntimeError('failed to fetch episode page')
+            return episode_num, page_html, None
         except Exception as e:
-            path_to_log = path.join('log', 'scraper_error_game_id_log.txt')
-            log = open(path_to_log, 'a')
-            log.write(str(episode_num)+'\n')
-            log.close()
-            print('\tError Episode #'+str(episode_num)+':', e)
+            return episode_num, None, e
+
+    def log_error(episode_num, error):
+        path_to_log = path.join('log', 'scraper_error_game_id_log.txt')
+        log = open(path_to_log, 'a')
+        log.write(str(episode_num)+'\n')
+        log.close()
+        print('\tError Episode #'+str(episode_num)+':', error)
+
+    def cast_batch(episode_dfs, episode_nums):
+        # The episodes are parsed without casting, so the dtypes (categories in
+        # particular) are set once over the whole batch. If that fails, each
+        # episode is cast on its own to log the ones at fault and keep the rest.
+        try:
+            return pd.concat(episode_dfs, ignore_index=True).astype(col_order_and_dtypes), episode_nums
+        except Exception:
+            good_dfs, good_nums = [], []
+            for episode_df, episode_num in zip(episode_dfs, episode_nums):
+                try:
+                    episode_df.astype(col_order_and_dtypes)
+                except Exception as e:
+                    log_error(episode_num, e)
+                    continue
+                good_dfs.append(episode_df)
+                good_nums.append(episode_num)
+
+            try:
+                return pd.concat(good_dfs, ignore_index=True).astype(col_order_and_dtypes), good_nums
+            except Exception as e:
+                for episode_num in good_nums:
+                    log_error(episode_num, e)
+                return None, []
+
+    def upload_batch(episode_dfs, episode_nums, batch_if_exists):
+        batch_df, episode_nums = cast_batch(episode_dfs, episode_nums)
+        if not episode_nums:
+            return False
+
+        print(f'Uploading {len(episode_nums)} episodes (#{episode_nums[0]}-#{episode_nums[-1]})')
+        for i in range(UPLOAD_TRIES):
+            try:
+                df_to_db(df=batch_df,
+                        project_id=project_id,
+                        dataset='dev_question_data',
+                        table_name='question_data',
+                        table_schema=game_table_schema,
+                        if_exists=batch_if_exists
+                        )
+                break
+            except Exception as e:
+                error = e
+                print(f'\tFailed upload, try {i + 1} of {UPLOAD_TRIES}:', e)
+        else:
+            for episode_num in episode_nums:
+                log_error(episode_num, error)
+            return False
+
+        # Only the upload is retried: the batch is in the table now, so a
+        # failure writing the checkpoint must not send it a second time
+        with open(DONE_LOG, 'a') as done_log:
+            done_log.writelines(f'{n}\n' for n in episode_nums)
+        return True
+
+    # Only the first successful upload honours if_exists, the rest append to it
+    batch_if_exists = if_exists
+    batch_dfs, batch_nums = [], []
+
+    def fetch_all(fetcher):
+        # Like fetcher.map(fetch, episode_nums), except map submits every fetch
+        # at once and would read the whole disk cache into memory
+        fetches = deque()
+        for episode_num in episode_nums:
+            while len(fetches) >= MAX_PENDING_FETCHES:
+                yield fetches.popleft().result()
+            fetches.append(fetcher.submit(fetch, episode_num))
+        while fetches:
+            yield fetches.popleft().result()
+
+    def parse(fetched, parser):
+        # Parsing is CPU bound, so it runs in a pool of processes rather than
+        # threads. Episodes are yielded in order as soon as the oldest pending
+        # parse finishes, so the fetches keep feeding the pool meanwhile. At
+        # most MAX_PENDING_PARSES are in flight, so pages read from the disk
+        # cache do not all pile up in the pool ahead of the uploads.
+        pending = deque()
+        for episode_num, page_html, error in fetched:
+            while len(pending) >= MAX_PENDING_PARSES:
+                yield result(*pending.popleft())
+
+            if error is None:
+                print(f'Parsing episode #{episode_num}')
+                # A broken pool (a worker died) refuses new work; the episode
+                # is logged as an error like any other failure
+                try:
+                    parse_future = parser.submit(parse_episode, page_html, episode_num, html_parser, False)
+                    pending.append((episode_num, parse_future, None))
+                except Exception as e:
+                    pending.append((episode_num, None, e))
+            else:
+                pending.append((episode_num, None, error))
+            while pending and (pending[0][1] is None or pending[0][1].done()):
+                yield result(*pending.popleft())
+        while pending:
+            yield result(*pending.popleft())
+
+    def result(episode_num, parse_future, error):
+        if parse_future is None:
+            return episode_num, None, error
+        try:
+            return episode_num, parse_future.result(), None
+        except Exception as e:
+            return episode_num, None, e
+
+    # The workers are spawned rather than forked: the pool starts while the
+    # fetch threads are running (one may hold the Scraper's lock), and forking
+    # a multi-threaded process can deadlock the child
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as fetcher, \
+         ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                             mp_context=multiprocessing.get_context('spawn')) as parser:
+        for episode_num, episode_df, error in parse(fetch_all(fetcher), parser):
+            if error is not None:
+                log_error(episode_num, error)
+                continue
+
+            batch_dfs.append(episode_df)
+            batch_nums.append(episode_num)
+            if len(batch_dfs) == BATCH_SIZE:
+                if upload_batch(batch_dfs, batch_nums, batch_if_exists):
+                    batch_if_exists = 'append'
+                batch_dfs, batch_nums = [], []
+
+    if batch_dfs:
+        upload_batch(batch_dfs, batch_nums, batch_if_exists)
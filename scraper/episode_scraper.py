@@ -1,15 +1,52 @@
+import os
 import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
-import json
 from scraper.utils.scraper import Scraper
 from scraper.utils.parsers import parse_metadata, parse_rounds, parse_fj, \
-                                  name_to_full_name_map, col_order_and_dtypes
+                                  name_to_full_name_map, col_order_and_dtypes, \
+                                  page_strainer
+
+def get_episode_html(scraper: Scraper \
+                    , episode_num: int \
+                    , episode_base_url: str \
+                    , html_dir: str = None) -> str:
+    """
+    Fetches the raw HTML of an episode. Aired games do not change, so when
+    html_dir is given the page is saved there and later runs read it from disk
+    without touching the network or the crawl delay. Only pages with a game
+    title are saved, so j-archive's error page for a game that is not posted
+    yet is fetched again next time.
+
+    Args:
+        scraper (Scraper): a class to store the j-archive scraper
+        episode_num (int): the episode number defined by j-archive
+        episode_base_url (str): the standard URL format from j-archive
+        html_dir (str): optional directory of saved episode pages
+
+    Returns:
+        str: the page HTML, or None if it could not be scraped
+    """
+
+    if html_dir:
+        html_path = os.path.join(html_dir, f'game_{episode_num}.html')
+        if os.path.exists(html_path):
+            with open(html_path, encoding='utf-8') as f:
+                return f.read()
+
+    page_html = scraper.get_page(episode_base_url + str(episode_num))
+
+    if html_dir and page_html is not None and 'id="game_title"' in page_html:
+        with open(html_path, 'w', encoding='utf-8') as f:
+            f.write(page_html)
+
+    return page_html
 
 def scrape_episode(scraper: Scraper \
                     , episode_num: int \
                     , html_parser: str \
-                    , episode_base_url: str) -> pd.DataFrame:
+                    , episode_base_url: str \
+                    , html_dir: str = None) -> pd.DataFrame:
     """
     The scraper that scrapes and parses over the entire episode.
 
@@ -18,15 +55,38 @@ def scrape_episode(scraper: Scraper \
         episode_base_url (str): the standard URL format from j-archive
         episode_num (int): the episode number defined by j-archive,  which will
             determine which episode to scrape and parse
+        html_dir (str): optional directory to cache episode pages in (see
+            get_episode_html())
 
     Returns:
-        pd.DataFrame: the complete game DataFrame
+        pd.DataFrame: the complete game DataFrame (see parse_episode())
+    """
+
+    page_html = get_episode_html(scraper, episode_num, episode_base_url, html_dir)
+
+    return parse_episode(page_html, episode_num, html_parser)
+
+def parse_episode(page_html: str \
+                    , episode_num: int \
+                    , html_parser: str \
+                    , set_dtypes: bool = True) -> pd.DataFrame:
     """
+    Parses the HTML of an entire episode. Needs no scraper, so pages that have
+    already been fetched can be parsed anywhere.
+
+    Args:
+        page_html (str): the raw HTML of the episode page
+        episode_num (int): the episode number defined by j-archive
+        html_parser (str): configuration on how to parse the HTML
+        set_dtypes (bool): whether to cast the columns to col_order_and_dtypes;
+            callers that concatenate many games can skip it and cast once
 
-    episode_url = episode_base_url + str(episode_num)
-    page_html = scraper.get_page(episode_url)
+    Returns:
+        pd.DataFrame: the complete game DataFrame, one row per responder in
+            round_num and order_num order
+    """
 
-    soup = BeautifulSoup(page_html, features=html_parser)
+    soup = BeautifulSoup(page_html, features=html_parser, parse_only=page_strainer)
 
     meta = parse_metadata(soup)
     episode_date = meta['date']
@@ -36,19 +96,11 @@ def scrape_episode(scraper: Scraper \
     contestants = meta['contestants']
     game_notes = meta['game_notes']
 
-    rounds_df = parse_rounds(soup, episode_date, html_parser)
-    # A shortcut to put the data in the format I want
-    rounds = rounds_df.to_json(orient='records')
-    rounds = json.loads(rounds)
-    rounds_df = pd.json_normalize(
-        data = rounds,
-        record_path = 'responders',
-        meta=['clue_id', 'clue_location', 'answer', 'order_num', 'value',
-              'was_daily_double', 'correct_response', 'category', 'round_num', 
-              'was_triple_stumper', 'wager', 'was_revealed']
-    )
-
-    final_jep_df = parse_fj(soup, html_parser)
+    # The parsers collect every responder name as they go, for the name mapping
+    seen_names = set()
+    rounds_df = parse_rounds(soup, episode_date, html_parser, seen_names)
+
+    final_jep_df = parse_fj(soup, html_parser, seen_names)
     episode_df = pd.concat([rounds_df, final_jep_df], ignore_index=True)
 
     episode_df['game_id'] = episode_num
@@ -58,13 +110,12 @@ def scrape_episode(scraper: Scraper \
     episode_df['tournament_name'] = tournament_name
     episode_df['game_notes'] = game_notes
 
-    contestants_short_names = episode_df[~episode_df['name'].isnull()]['name'].unique()
-    name_map, id_map = name_to_full_name_map(contestants_short_names, contestants)
-    episode_df['player_id'] = episode_df['name'].replace(id_map)
-    episode_df['name'].replace(name_map, inplace=True)
+    name_map, id_map = name_to_full_name_map(seen_names, contestants)
+    episode_df['player_id'] = episode_df['name'].map(id_map)
+    episode_df['name'] = episode_df['name'].map(name_map).fillna(episode_df['name'])
     
     episode_df = episode_df[col_order_and_dtypes.keys()]
-    episode_df = episode_df.astype(col_order_and_dtypes)
-    episode_df.sort_values(by=['round_num', 'order_num'], inplace=True)
+    if set_dtypes:
+        episode_df = episode_df.astype(col_order_and_dtypes)
 
     return episode_df
\ No newline at end of file
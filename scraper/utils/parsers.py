@@ -1,10 +1,85 @@
 import numpy as np
 import pandas as pd
-from bs4 import BeautifulSoup
-from datetime import datetime, date
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from calendar import month_name
+from datetime import date
 from difflib import get_close_matches
+from html import unescape
+from sys import intern
 import re
 
+# Only the containers read by the parsers below are built into the page soup
+page_strainer = SoupStrainer(id=['game_title', 'game_comments', 'contestants',
+                                 'jeopardy_round', 'double_jeopardy_round',
+                                 'final_jeopardy_round'])
+fj_response_strainer = SoupStrainer(['tr', 'em'])
+
+# Board column and row (1-5, the value multiplier) of each clue, in the order
+# the 30 clues of a round appear in the HTML
+clue_cols = np.tile(np.arange(1, 7), 5)
+clue_rows = np.repeat(np.arange(1, 6), 6)
+j_clue_locations = np.array([f'J_{col}_{row}' for col, row in zip(clue_cols, clue_rows)],
+                            dtype=object)
+dj_clue_locations = 'D' + j_clue_locations
+
+# Every clue location, so the column is stored as small integer codes with the
+# same categories in every game and batch
+clue_location_dtype = pd.CategoricalDtype([*j_clue_locations, *dj_clue_locations, 'FJ'])
+
+# Show number and date from a title like 'Show #4000 - Monday, March 1, 2002'
+game_title_re = re.compile(r'#(\d+)\s+-\s+\w+,\s+(\w+)\s+(\d+),\s+(\d+)')
+month_nums = {name: num for num, name in enumerate(month_name) if name}
+
+# Classes of the nodes inside a clue that parse_clues() reads
+clue_node_classes = {'clue_value', 'clue_value_daily_double', 'clue_text',
+                     'clue_order_number'}
+
+# Columns returned by parse_clues(), one row per responder
+clue_columns = ('clue_position', 'clue_id', 'answer', 'order_num',
+                'was_revealed', 'value', 'was_daily_double', 'wager',
+                'correct_response', 'was_triple_stumper', 'name', 'was_correct')
+
+# The pieces of a clue's onmouseover response HTML read by parse_response()
+# and parse_fj()
+correct_response_re = re.compile(r'<em class="correct_response"[^>]*>(.*?)</em>', re.S)
+responder_re = re.compile(r'<td class="(right|wrong)"[^>]*>(.*?)</td>', re.S)
+fj_cell_re = re.compile(r'<td[^>]*>(.*?)</td>', re.S)
+markup_re = re.compile(r'<[^>]*>')
+
+# Strips the $ and thousands separators from dollar amounts in one pass
+strip_money_table = str.maketrans('', '', '$,')
+
+
+def leaf_text(tag: Tag) -> str:
+    """
+    Gets the text of a tag, reading its single string directly when it has one
+    instead of walking and joining all of its descendants.
+
+    Args:
+        tag (Tag): the tag to read
+
+    Returns:
+        (str): the tag's text as a plain str (no reference back to the soup)
+    """
+
+    string = tag.string
+    return str(string) if string is not None else tag.get_text()
+
+
+def markup_text(fragment: str) -> str:
+    """
+    Gets the text of an HTML fragment matched out of a response string, the
+    same as .text would give for it parsed into a soup.
+
+    Args:
+        fragment (str): the HTML between a tag's opening and closing
+
+    Returns:
+        (str): the fragment with tags removed and entities unescaped
+    """
+
+    return unescape(markup_re.sub('', fragment))
+
 
 def parse_tournament(game_notes: str) -> dict:
     """
@@ -69,25 +144,24 @@ def parse_metadata(page_html: BeautifulSoup) -> dict:
             one Jeopardy game
 
     Returns:
-        (dict): containing episode date (date), show number (str), and 
+        (dict): containing episode date (date), show number (int), and 
             contestants' named and ids (dict)
     """
 
-    game_title = page_html.select_one('#game_title').text
-
-    long_date = game_title[game_title.find(',')+2:]
-    episode_date = datetime.strptime(long_date, '%B %d, %Y').date()
+    game_title = page_html.find(id='game_title').text
 
-    show_num = game_title.split('#')[1].split(' ')[0]
+    title_match = game_title_re.search(game_title)
+    show_num = int(title_match.group(1))
+    episode_date = date(int(title_match.group(4)),
+                        month_nums[title_match.group(2)],
+                        int(title_match.group(3)))
 
-    contestants = page_html.select('.contestants')
-    contestants_dict = {}
-    for contestant in contestants:
-        full_name = contestant.text.split(',')[0]
-        player_id = contestant.a['href'].split('=')[1]
-        contestants_dict[full_name] = player_id
+    contestants = page_html.find_all(class_='contestants')
+    contestants_dict = {contestant.text.split(',', 1)[0]:
+                            int(contestant.a['href'].rsplit('=', 1)[1])
+                        for contestant in contestants}
 
-    game_notes = page_html.select_one('#game_comments').text
+    game_notes = page_html.find(id='game_comments').text
 
     was_tournament, tournament_name = parse_tournament(game_notes)
 
@@ -110,40 +184,35 @@ def parse_category_name(board_html: BeautifulSoup) -> list:
         cats (list): a list of round categories
     """
 
-    category_names_html = board_html.select('.category_name')
+    category_names_html = board_html.find_all(class_='category_name')
     cats = []
     for category_name_html in category_names_html:
-        cat = category_name_html.text
-        cats.append(cat)
+        cat = leaf_text(category_name_html)
+        cats.append(intern(cat))
 
     return cats
 
 
-def parse_value(clue_html: BeautifulSoup) -> dict:
+def parse_value(value: Tag, dd_value: Tag) -> dict:
     """
     Parses the clue values of non-Daily Double clues
 
     Args:
-        clue_html (BeautifulSoup): the soup from one clue
+        value (Tag): the clue's .clue_value node, if any
+        dd_value (Tag): the clue's .clue_value_daily_double node, if any
 
     Returns:
-        (dict): value (str) of the clue's value, was_daily_double (bool) 
-            indicating whether the clue was a daily double, and wager (str) for 
+        (dict): value (int) of the clue's value, was_daily_double (bool) 
+            indicating whether the clue was a daily double, and wager (int) for 
             daily doubles only
     """
 
-    value = clue_html.select_one('.clue_value')
-    dd_value = clue_html.select_one('.clue_value_daily_double')
-
     if dd_value:
         value = None
         is_dd = True
-        wager = dd_value.text \
-                        .replace('DD: ', '') \
-                        .replace('$', '')    \
-                        .replace(',', '')
+        wager = int(leaf_text(dd_value).removeprefix('DD: ').translate(strip_money_table))
     else:
-        value = value.text.replace('$', '').replace(',', '')
+        value = int(leaf_text(value).translate(strip_money_table))
         is_dd = False
         wager = None
 
@@ -152,14 +221,15 @@ def parse_value(clue_html: BeautifulSoup) -> dict:
             'wager': wager}
 
 
-def parse_response(clue_html: BeautifulSoup, html_parser: str) -> dict:
+def parse_response(response_div: Tag, html_parser: str, seen_names: set) -> dict:
     """
     Parses the correct responders, responders (with name and whether correct),
     and whether the clue was a triple stumper.
 
     Args:
-        clue_html (BeautifulSoup): the soup from one clue
+        response_div (Tag): the clue's div whose onmouseover holds the response
         html_parser (str): configuration on how to parse the HTML
+        seen_names (set): the responder names found so far, added to in place
 
     Returns:
         response (dict): containing correct_response (str), 
@@ -167,11 +237,24 @@ def parse_response(clue_html: BeautifulSoup, html_parser: str) -> dict:
             and was_triple_stumper (bool)
     """
 
-    response_html = clue_html.find('div', {'onmouseover': True})['onmouseover']
-    response_soup = BeautifulSoup(response_html, html_parser)
-
-    correct_response_soup = response_soup.select_one('.correct_response')
-    correct_response = correct_response_soup.text
+    response_html = response_div['onmouseover']
+
+    # The response HTML is small and regular, so it is read with regexes rather
+    # than parsed into its own soup. The matches are only used when every cell
+    # was read as a responder and the correct response has no nested <em> that
+    # would cut it short; anything else falls back to a full soup, unstrained
+    # since a class strainer misses cells with more than one class.
+    correct_response_match = correct_response_re.search(response_html)
+    responders = [(result, markup_text(name))
+                  for result, name in responder_re.findall(response_html)]
+    if correct_response_match and '<em' not in correct_response_match[1] \
+            and len(responders) == response_html.count('<td'):
+        correct_response = markup_text(correct_response_match[1])
+    else:
+        response_soup = BeautifulSoup(response_html, html_parser)
+        correct_response = response_soup.find(class_='correct_response').text
+        responders = [(result, leaf_text(td)) for result in ('right', 'wrong')
+                      for td in response_soup.find_all(class_=result)]
 
     response = {
         'correct_response': correct_response,
@@ -179,22 +262,26 @@ def parse_response(clue_html: BeautifulSoup, html_parser: str) -> dict:
         'was_triple_stumper': False
     }
 
-    correct_responder_soup = response_soup.select_one('.right')
-    if correct_responder_soup:
+    correct_names = [name for result, name in responders if result == 'right']
+    if correct_names:
+        name = intern(correct_names[0])
+        seen_names.add(name)
         correct_response_dict = {
-            'name': correct_responder_soup.text, 
+            'name': name, 
             'was_correct': True
         }
         response['responders'].append(correct_response_dict)
 
-    incorrect_responders_soup = response_soup.select('.wrong')
-    if incorrect_responders_soup:
-        for incorrect_responder in incorrect_responders_soup:
-            if incorrect_responder.text == 'Triple Stumper':
+    incorrect_names = [name for result, name in responders if result == 'wrong']
+    if incorrect_names:
+        for incorrect_name in incorrect_names:
+            if incorrect_name == 'Triple Stumper':
                 response['was_triple_stumper'] = True
             else:
+                name = intern(incorrect_name)
+                seen_names.add(name)
                 incorrect_response_dict = {
-                    'name': incorrect_responder.text,
+                    'name': name,
                     'was_correct': False
                 }
                 response['responders'].append(incorrect_response_dict)
@@ -210,51 +297,103 @@ def parse_response(clue_html: BeautifulSoup, html_parser: str) -> dict:
     return response
 
 
-def parse_clues(board_html: BeautifulSoup, html_parser: str) -> pd.DataFrame:
+def find_clue_nodes(clue_html: BeautifulSoup) -> dict:
+    """
+    Collects the nodes of one clue that the parsers read, in a single walk
+    over its descendants instead of one search per node.
+
+    Args:
+        clue_html (BeautifulSoup): the soup from one clue
+
+    Returns:
+        nodes (dict): the first node with each class in clue_node_classes,
+            plus the first 'a' tag and the 'onmouseover' div
+    """
+
+    nodes = {}
+    for node in clue_html.descendants:
+        if not isinstance(node, Tag):
+            continue
+        if node.name == 'a':
+            nodes.setdefault('a', node)
+        elif node.name == 'div' and 'onmouseover' in node.attrs:
+            nodes.setdefault('onmouseover', node)
+        for class_name in node.get('class', ()):
+            if class_name in clue_node_classes:
+                nodes.setdefault(class_name, node)
+
+    return nodes
+
+
+def parse_clues(board_html: BeautifulSoup, html_parser: str, \
+                seen_names: set) -> dict:
     """
     Parses all information from all clues and also applies the parse_value() and 
-    parse_value() functions. Converts from dictionaries to a dataframe.
+    parse_response() functions.
 
     Args:
         board_html (BeautifulSoup): the soup from one round
         html_parser (str): configuration on how to parse the HTML
+        seen_names (set): the responder names found so far, added to in place
 
     Returns:
-        (pd.DataFrame): a dataframe containing the following clue fields:
-            'clue_id', 'clue_location', 'answer', 'order_num', 'value',
-            'was_daily_double', 'wager', 'correct_response', 'responders',
-            'was_triple_stumper', 'responders', 'was_revealed'
+        board_cols (dict): a list per column of clue_columns, with one entry
+            per responder (repeating the clue's fields) in selection order
+            (order_num), followed by the unrevealed clues in board order:
+            'clue_position' (index of the clue on the board), 'clue_id',
+            'answer', 'order_num', 'was_revealed', 'value',
+            'was_daily_double', 'wager', 'correct_response',
+            'was_triple_stumper', 'name', 'was_correct'
     """
 
-    clues_html = board_html.select('.clue')
-
-    clue_dicts = []
-    for clue_html in clues_html:
-        if clue_html.text.strip():
-            value_dict = parse_value(clue_html)
-            response_dict = parse_response(clue_html, html_parser)
+    clues_html = board_html.find_all(class_='clue')
+
+    clues = []
+    for clue_position, clue_html in enumerate(clues_html):
+        # Unrevealed clues are empty cells, without the clue's anchor or text.
+        # A cell with only one of them is not a layout the parsers know.
+        nodes = find_clue_nodes(clue_html)
+        if ('a' in nodes) != ('clue_text' in nodes):
+            raise ValueError(f'Clue {clue_position + 1} of the board has only '
+                             f'one of its anchor and clue text')
+        if 'a' in nodes:
+            value_dict = parse_value(nodes.get('clue_value'),
+                                     nodes.get('clue_value_daily_double'))
+            response_dict = parse_response(nodes['onmouseover'], html_parser,
+                                           seen_names)
+
+            clue_id = int(nodes['a']['href'].split('=')[-1])
+            answer = nodes['clue_text'].text
+            order_num = int(leaf_text(nodes['clue_order_number']))
+
+            clue_row = (clue_position, clue_id, answer, order_num, True,
+                        value_dict['value'],
+                        value_dict['was_daily_double'],
+                        value_dict['wager'],
+                        response_dict['correct_response'],
+                        response_dict['was_triple_stumper'])
+            responders = response_dict['responders']
+            sort_key = order_num
+        else:
+            clue_row = (clue_position, np.nan, np.nan, np.nan, False, np.nan,
+                        False, np.nan, np.nan, False)
+            responders = [{'name': None, 'was_correct': None}]
+            sort_key = np.inf
 
-            clue_id = clue_html.a['href'].split('=')[-1]
-            answer = clue_html.select_one('.clue_text').text
-            order_num = clue_html.select_one('.clue_order_number').text
+        clues.append((sort_key, clue_row, responders))
 
-            clue_dict = {'clue_id': clue_id,
-                         'answer': answer,
-                         'order_num': order_num,
-                         'was_revealed': True}
-            clue_dict.update(value_dict)
-            clue_dict.update(response_dict)
-        else:
-            keys = ['clue_id', 'clue_location', 'answer', 'order_num', 
-                    'value', 'was_daily_double', 'wager',
-                    'correct_response', 'responders', 'was_triple_stumper']
-            clue_dict = {k: np.nan for k in keys}
-            clue_dict['responders'] = [{'name': None, 'was_correct': None}]
-            clue_dict['was_revealed'] = False
+    # The clues are emitted in the order they were picked, so the episode frame
+    # comes out ordered by round_num and order_num without sorting it
+    clues.sort(key=lambda clue: clue[0])
 
-        clue_dicts.append(clue_dict)
+    board_cols = {col: [] for col in clue_columns}
+    for _, clue_row, responders in clues:
+        for responder in responders:
+            responder_row = clue_row + (responder['name'], responder['was_correct'])
+            for column, field in zip(board_cols.values(), responder_row):
+                column.append(field)
 
-    return pd.DataFrame(clue_dicts)
+    return board_cols
 
 
 def infer_clue_location(df: pd.DataFrame) -> pd.DataFrame:
@@ -263,34 +402,29 @@ def infer_clue_location(df: pd.DataFrame) -> pd.DataFrame:
     function infers the location based on the order of clues.
 
     Args:
-        df (pd.DataFrame): a dataframe of round data
+        df (pd.DataFrame): a dataframe of round data, with each row's
+            clue_position on the board
 
     Returns:
         df (pd.DataFrame): a dataframe of round data with clue_location added
     """
 
-    clue_locations = \
-    ['J_1_1','J_2_1','J_3_1','J_4_1','J_5_1','J_6_1',
-     'J_1_2','J_2_2','J_3_2','J_4_2','J_5_2','J_6_2',
-     'J_1_3','J_2_3','J_3_3','J_4_3','J_5_3','J_6_3',
-     'J_1_4','J_2_4','J_3_4','J_4_4','J_5_4','J_6_4',
-     'J_1_5','J_2_5','J_3_5','J_4_5','J_5_5','J_6_5']
-
-    df['clue_location'] = clue_locations
-    df['clue_location'] = np.where(df['round_num'] == 2, 
-                                   'D' + df['clue_location'],
-                                   df['clue_location']
-                                  )
+    clue_positions = df['clue_position'].to_numpy()
+    df['clue_location'] = pd.Categorical(np.where(df['round_num'] == 2, 
+                                                  dj_clue_locations[clue_positions],
+                                                  j_clue_locations[clue_positions]),
+                                         dtype=clue_location_dtype)
     return df
 
 
 def infer_missing_value(df: pd.DataFrame, dt: date) -> pd.DataFrame:
     """
     For clues where the clue value is ambiguous in the HTML soup (such as with
-    daily doubles), this function infers the value based on the clue location.
+    daily doubles), this function infers the value based on the clue's row.
 
     Args:
-        df (pd.DataFrame): a dataframe of round data
+        df (pd.DataFrame): a dataframe of round data, with each row's
+            clue_position on the board
         dt (date): the game date (from parse_metadata())
 
     Returns:
@@ -298,16 +432,14 @@ def infer_missing_value(df: pd.DataFrame, dt: date) -> pd.DataFrame:
     """
 
     money_multiple = 200 if dt >= date(2001, 11, 26) else 100
-    df['value'].fillna(value = df['round_num'] \
-                                * df['clue_location'].str[-1].astype(int) \
-                                * money_multiple, 
-                       inplace=True
-                      )
+    df['value'] = df['value'].fillna(df['round_num'] \
+                                     * clue_rows[df['clue_position'].to_numpy()] \
+                                     * money_multiple)
     return df
 
 
 def parse_rounds(page_soup: BeautifulSoup, episode_date: date, \
-                 html_parser: str) -> pd.DataFrame:
+                 html_parser: str, seen_names: set) -> pd.DataFrame:
     """
     Parses over all rounds in the game. Calls parse_clues() and
     parse_category_name().
@@ -316,87 +448,114 @@ def parse_rounds(page_soup: BeautifulSoup, episode_date: date, \
         page_soup (BeautifulSoup): the full page of soup from one game
         episode_date (date): the game date (from parse_metadata()) 
         html_parser (str): configuration on how to parse the HTML
+        seen_names (set): the responder names found so far, added to in place
 
     Returns:
-        (pd.DataFrame): a dataframe of round data
+        (pd.DataFrame): a dataframe of round data, one row per responder
     """
 
-    boards = page_soup.select('.round')
+    boards = page_soup.find_all(class_='round')
 
-    clue_dfs = []
+    # Clues from every round go into one set of column lists so the frame is
+    # only built once
+    cols = {col: [] for col in clue_columns + ('category', 'round_num')}
     for round_num, board in enumerate(boards):
         categories = parse_category_name(board)
-        clue_df = parse_clues(board, html_parser)
-        clue_df['category'] = categories * 5
-        clue_df['round_num'] = round_num + 1
-        clue_df = infer_clue_location(clue_df)
-        clue_df = infer_missing_value(clue_df, episode_date)
-        clue_dfs.append(clue_df)
+        board_cols = parse_clues(board, html_parser, seen_names)
+        for col, values in board_cols.items():
+            cols[col] += values
+
+        clue_positions = board_cols['clue_position']
+        cols['category'] += [categories[i % len(categories)] for i in clue_positions]
+        cols['round_num'] += [round_num + 1] * len(clue_positions)
 
-    return pd.concat(clue_dfs)
+    df = pd.DataFrame(cols)
+    df = infer_clue_location(df)
+    df = infer_missing_value(df, episode_date)
+    df.drop(columns=['clue_position'], inplace=True)
+
+    return df
 
 
-def parse_fj(page_soup: BeautifulSoup, html_parser: str) -> pd.DataFrame:
+def parse_fj(page_soup: BeautifulSoup, html_parser: str, \
+             seen_names: set) -> pd.DataFrame:
     """
     A parser for Final Jeopardy.
 
     Args:
         page_soup (BeautifulSoup): the full page of soup from one game
         html_parser (str): configuration on how to parse the HTML
+        seen_names (set): the responder names found so far, added to in place
 
     Returns:
         pd.DataFrame: a dataframe of Final Jeopardy data
     """
 
-    fj_board = page_soup.select_one('.final_round')
-    category = fj_board.select_one('.category_name').text
+    fj_board = page_soup.find(class_='final_round')
+    category = leaf_text(fj_board.find(class_='category_name'))
 
-    answer = fj_board.select_one('.clue_text').text
+    answer = fj_board.find(class_='clue_text').text
 
+    # Each contestant has a row of name and response followed by a wager row.
+    # As in parse_response(), these are matched straight out of the onmouseover
+    # string, but only when every <em> and <td> was matched and each contestant
+    # has a matched name cell; otherwise it falls back to a soup.
     response_html = fj_board.find('div', {'onmouseover': True})['onmouseover']
-    response_soup = BeautifulSoup(response_html, html_parser)
-    correct_responders = response_soup.select('.right')
-    correct_responders = [cr.text for cr in correct_responders]
-
-    correct_response = response_soup.select('em')[-1].text
-
-    rows = []
-    row = []
-    response_table = response_soup.select('tr')
-    for row_i, tr in enumerate(response_table):
-        td = tr.find_all('td')
-        contents = [tr.text for tr in td]
-        if row_i % 2 == 0:
-            row = contents
-        else:
-            row += contents
-            rows.append(row)
-
-    df = pd.DataFrame(rows, columns=['name', 'response', 'wager'])
-    df['wager'] = df['wager'].str.replace('$','', regex=False).str.replace(',','', regex=False)
-    df['clue_id'] = None
-    df['clue_location'] = 'FJ'
-    df['answer'] = answer
-    df['category'] = category
-    df['correct_response'] = correct_response
-    df['round_num'] = 3
-    df['was_daily_double'] = False
-    df['order_num'] = 1
-    df['was_correct'] = df['name'].isin(correct_responders)
-    df['was_triple_stumper'] = True if len(correct_responders) == 0 else False
-    df['value'] = None
-    df['was_revealed'] = True
-    df.drop(columns=['response'], inplace=True)
+    correct_response_matches = correct_response_re.findall(response_html)
+    fj_cells = [markup_text(cell) for cell in fj_cell_re.findall(response_html)]
+    responders = responder_re.findall(response_html)
+    if correct_response_matches and fj_cells \
+            and len(correct_response_matches) == response_html.count('<em') \
+            and len(fj_cells) == response_html.count('<td') \
+            and len(fj_cells) == 3 * len(responders):
+        correct_response = markup_text(correct_response_matches[-1])
+        correct_responders = [markup_text(name) for result, name in responders
+                              if result == 'right']
+    else:
+        response_soup = BeautifulSoup(response_html, html_parser,
+                                      parse_only=fj_response_strainer)
+        correct_response = response_soup.find_all('em')[-1].text
+        correct_responders = [leaf_text(cr) for cr
+                              in response_soup.find_all(class_='right')]
+        fj_cells = [leaf_text(td) for td in response_soup.find_all('td')]
+
+    if len(fj_cells) % 3:
+        raise ValueError(f'Expected 3 Final Jeopardy cells per contestant, got {len(fj_cells)}')
+    rows = np.asarray(fj_cells, dtype=object).reshape(-1, 3)
+    names = rows[:, 0]
+    seen_names.update(names)
+
+    # The numeric columns use the same float/NaN dtypes as parse_rounds(), so
+    # appending these rows to the rounds does not upcast any column
+    df = pd.DataFrame({
+        'name': names,
+        'wager': [float(wager.translate(strip_money_table)) for wager in rows[:, 2]],
+        'clue_id': np.nan,
+        'clue_location': pd.Categorical(['FJ'] * len(names), dtype=clue_location_dtype),
+        'answer': answer,
+        'category': category,
+        'correct_response': correct_response,
+        'round_num': 3,
+        'was_daily_double': False,
+        'order_num': 1.0,
+        'was_correct': np.isin(names, correct_responders),
+        'was_triple_stumper': len(correct_responders) == 0,
+        'value': np.nan,
+        'was_revealed': True
+    })
 
     return df
 
-def name_to_full_name_map(first_names: list, full_names_and_ids: dict) -> (dict, dict):
+def name_to_full_name_map(first_names: set, full_names_and_ids: dict) -> (dict, dict):
     """
     Maps first names returned by parsing the rounds to the full name found in
-    the game metadata.
+    the game metadata. A first name that is the first word of exactly one full
+    name is looked up directly, then one that starts exactly one full name
+    (e.g. 'Chris' for 'Christopher'); other nicknames and shared first names
+    fall back to fuzzy matching.
 
     Args:
-        first_names (list): the first names found in the game
+        first_names (set): the first names found in the game
         full_names_and_ids (dict): the {full_name : id} parsed
             in the game metadata in parse_metadata()
 
@@ -408,37 +567,48 @@ def name_to_full_name_map(first_names: list, full_names_and_ids: dict) -> (dict,
     name_map = {}
     id_map = {}
     contestants_full_names = list(full_names_and_ids.keys())
+
+    first_to_full_names = {}
+    for full_name in contestants_full_names:
+        first_to_full_names.setdefault(full_name.split(' ', 1)[0], []).append(full_name)
+
     for first_name in first_names:
-        name_map[first_name] = get_close_matches(first_name, 
-                                                     possibilities=contestants_full_names, 
-                                                     n=1, 
-                                                     cutoff=0.01
-                                                )[0]
+        matches = first_to_full_names.get(first_name) \
+                  or [full_name for full_name in contestants_full_names
+                      if full_name.startswith(first_name)]
+        if len(matches) == 1:
+            name_map[first_name] = matches[0]
+        else:
+            name_map[first_name] = get_close_matches(first_name, 
+                                                         possibilities=contestants_full_names, 
+                                                         n=1, 
+                                                         cutoff=0.01
+                                                    )[0]
         id_map[first_name] = full_names_and_ids[name_map[first_name]]
 
     return name_map, id_map
 
 col_order_and_dtypes = {
-    'game_id': 'float', 
-    'show_num': 'float', 
+    'game_id': 'Int64', 
+    'show_num': 'Int64', 
     'date': 'datetime64[ns]',
     'was_tournament': 'bool',
     'tournament_name': 'string',
-    'clue_id': 'float', 
-    'clue_location': 'string', 
-    'round_num': 'float', 
-    'value': 'float', 
-    'order_num': 'float', 
-    'category': 'string',
+    'clue_id': 'Int64', 
+    'clue_location': clue_location_dtype, 
+    'round_num': 'Int64', 
+    'value': 'Int64', 
+    'order_num': 'Int64', 
+    'category': 'category',
     'answer': 'string', 
     'correct_response': 'string', 
-    'name': 'string', 
-    'player_id': 'float', 
+    'name': 'category', 
+    'player_id': 'category', 
     'was_correct': 'bool', 
     'was_revealed': 'bool', 
     'was_triple_stumper': 'bool', 
     'was_daily_double': 'bool', 
-    'wager': 'float',
+    'wager': 'Int64',
     'game_notes': 'string'
 }
     
\ No newline at end of file
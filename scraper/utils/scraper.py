@@ -1,36 +1,113 @@
+import os
 import time
+import json
 import warnings
 import logging
-import datetime
+import threading
+import urllib.error
+import urllib.request
 import urllib.robotparser
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+ROBOTS_CACHE_SECONDS = 24 * 60 * 60
+_robots_cache_lock = threading.Lock()
+
 
 class Scraper:
-    def __init__(self, robots_txt_url, n_tries=3):
+    def __init__(self, robots_txt_url, n_tries=3, min_delay_seconds=1.5,
+                 robots_cache_path=None, pool_size=10):
         self.n_tries = n_tries
 
-        self.robot_parser = urllib.robotparser.RobotFileParser()
-        self.robot_parser.set_url(robots_txt_url)
-        self.robot_parser.read()
+        # One pooled session so every page reuses the same keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.robot_parser = self._load_robot_parser(robots_txt_url, robots_cache_path)
 
         self.crawl_delay_seconds = self.robot_parser.crawl_delay(useragent='*')
         if self.crawl_delay_seconds is None:
             self.crawl_delay_seconds = 0
+        self.crawl_delay_seconds = max(self.crawl_delay_seconds, min_delay_seconds)
 
+        # Serializes the rate limiting when get_page is called from several threads
+        self._request_lock = threading.Lock()
         self.last_request_timestamp = None
         self._update_last_request_timestamp()
 
+    @staticmethod
+    def _load_robot_parser(robots_txt_url, robots_cache_path=None):
+        # The robots.txt text is cached for ROBOTS_CACHE_SECONDS, which saves
+        # refetching it every time the process is restarted. Only the text is
+        # stored and it is parsed again on load.
+        robot_parser = urllib.robotparser.RobotFileParser(robots_txt_url)
+
+        with _robots_cache_lock:
+            robots_txt = Scraper._read_robots_cache(robots_txt_url, robots_cache_path)
+            if robots_txt is not None:
+                logger.info(f'Using cached robots.txt from {robots_cache_path}.')
+                robot_parser.parse(robots_txt.splitlines())
+                return robot_parser
+
+            # Fetched like RobotFileParser.read(), keeping the text to cache
+            try:
+                with urllib.request.urlopen(robots_txt_url) as f:
+                    robots_txt = f.read().decode('utf-8')
+                robot_parser.parse(robots_txt.splitlines())
+            except urllib.error.HTTPError as err:
+                if err.code in (401, 403):
+                    robot_parser.disallow_all = True
+                elif 400 <= err.code < 500:
+                    robot_parser.allow_all = True
+                err.close()
+
+            # A robots.txt that could not be read is not cached, so the next
+            # start retries it instead of reusing a parser that allows nothing
+            if robots_cache_path and robot_parser.mtime():
+                Scraper._write_robots_cache(robots_txt_url, robots_txt, robots_cache_path)
+
+            return robot_parser
+
+    @staticmethod
+    def _read_robots_cache(robots_txt_url, robots_cache_path):
+        if not robots_cache_path or not os.path.exists(robots_cache_path):
+            return None
+
+        # Any unreadable or stale cache is treated as a miss
+        try:
+            if time.time() - os.path.getmtime(robots_cache_path) >= ROBOTS_CACHE_SECONDS:
+                return None
+            with open(robots_cache_path, encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache['url'] != robots_txt_url:
+                return None
+            return str(cache['robots_txt'])
+        except Exception as e:
+            logger.warning(f'Ignoring unreadable robots.txt cache {robots_cache_path}: {e}')
+            return None
+
+    @staticmethod
+    def _write_robots_cache(robots_txt_url, robots_txt, robots_cache_path):
+        # Written to a temporary file and moved into place, so another process
+        # never reads a half-written cache
+        tmp_path = f'{robots_cache_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'url': robots_txt_url, 'robots_txt': robots_txt}, f)
+            os.replace(tmp_path, robots_cache_path)
+        except OSError as e:
+            logger.warning(f'Could not write robots.txt cache {robots_cache_path}: {e}')
+
     @property
     def seconds_waited(self):
-        now = datetime.datetime.utcnow()
-        wait_time = now - self.last_request_timestamp
-        return wait_time.seconds
+        return time.monotonic() - self.last_request_timestamp
 
     def _wait_on_request_rate(self):
-        logger.info(f'Waiting for {self.crawl_delay_seconds} second crawl delay (per robots.txt).')
+        logger.info(f'Waiting for {self.crawl_delay_seconds} second crawl delay.')
 
         while True:
             if self.seconds_waited >= self.crawl_delay_seconds:
@@ -39,17 +116,19 @@ class Scraper:
                 time.sleep(0.1)
 
     def _update_last_request_timestamp(self):
-        self.last_request_timestamp = datetime.datetime.utcnow()
+        self.last_request_timestamp = time.monotonic()
 
     def _get_page(self, url):
         # noinspection PyArgumentList
         if not self.robot_parser.can_fetch(useragent='*', url=url):
             raise PermissionError('URL disallowed for useragent="*"')
 
-        self._wait_on_request_rate()
-        self._update_last_request_timestamp()
+        with self._request_lock:
+            self._wait_on_request_rate()
+            self._update_last_request_timestamp()
 
-        response = requests.get(url)
+        response = self.session.get(url)
+        response.raise_for_status()
         html_text = response.text
 
         return html_text